@@ -1,7 +1,7 @@
 """
 AI Lead Automator - Production-Ready Modular Architecture
 Tech Stack: Streamlit, Firecrawl, OpenAI/Anthropic, Pandas, Plotly
-Security: Fernet Encryption, Input Validation, GDPR Compliance
+Security: AES-GCM Encryption, Input Validation, GDPR Compliance
 Date: January 2026
 """
 
@@ -88,7 +88,7 @@ def render_sidebar(data_manager: DataManager, kb_stats: dict):
     <small>
     <strong>100% Local & Secure</strong><br>
     All data stored on your computer<br>
-    API keys encrypted with Fernet<br><br>
+    API keys encrypted with AES-256-GCM<br><br>
     <strong>Version:</strong> {Constants.APP_VERSION}<br>
     <strong>Powered by:</strong><br>
     Firecrawl | AI | Streamlit
@@ -137,7 +137,11 @@ def main():
         else:
             # Use cached KB service
             kb_service = st.session_state.get('kb_service')
-            kb_stats = st.session_state.get('kb_stats', kb_stats)
+            if kb_service:
+                # Recomputed only after documents are added or deleted
+                kb_stats = UIPages.get_kb_stats(kb_service)
+            else:
+                kb_stats = st.session_state.get('kb_stats', kb_stats)
             logger.debug("Using cached Knowledge Base Service")
         
         if 'ui_pages' not in st.session_state:
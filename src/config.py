@@ -52,6 +52,7 @@ class AppConfig:
     
     # Rate Limiting
     rate_limit_delay: float = 1.0  # seconds between bulk requests
+    bulk_max_workers: int = 4  # concurrent URL analyses in bulk mode
     
     # Security
     min_password_length: int = 8
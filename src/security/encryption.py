@@ -1,10 +1,16 @@
 """
 Security Module - Encryption and Key Management
-Implements Fernet encryption for secure API key storage
+Implements AES-256-GCM encryption for secure API key storage
 """
 
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+import base64
 import json
+import os
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional
 import secrets
@@ -12,8 +18,24 @@ import hashlib
 
 from src.config import KEY_FILE, CONFIG_FILE, get_logger
 
+try:
+    import orjson
+    
+    def _json_dumps(data: Dict) -> bytes:
+        return orjson.dumps(data)
+    
+    _json_loads = orjson.loads  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+except ImportError:
+    def _json_dumps(data: Dict) -> bytes:
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
+    
+    _json_loads = json.loads
+
 logger = get_logger(__name__)
 
+# Key file is raw bytes; only meaningful (and defined) on Windows
+_O_BINARY = getattr(os, 'O_BINARY', 0)
+
 
 class EncryptionError(Exception):
     """Custom exception for encryption errors"""
@@ -21,45 +43,103 @@ class EncryptionError(Exception):
 
 
 class KeyManager:
-    """Secure key management with Fernet encryption"""
+    """Secure key management with AES-256-GCM encryption"""
+    
+    KEY_SIZE = 32  # bytes (AES-256)
+    NONCE_SIZE = 12  # bytes (96-bit GCM nonce)
     
     def __init__(self, key_file: Path = KEY_FILE):
         self.key_file = key_file
-        self._cipher: Optional[Fernet] = None
+        # Key is loaded (or created) up front so the key file exists from construction
+        self._load_ciphers()
+    
+    def _load_ciphers(self):
+        """Load the key and build the cipher contexts once (reused by every encrypt/decrypt)"""
+        self._key = self._get_or_create_key()
+        self._cipher = AESGCM(self._decode_key(self._key))
+        self._legacy_cipher: Optional[Fernet] = None  # Built on first legacy decrypt
+    
+    def _decode_key(self, key: bytes) -> bytes:
+        """Decode the stored urlsafe-base64 key to raw AES key bytes"""
+        raw_key = base64.urlsafe_b64decode(key)
+        if len(raw_key) != self.KEY_SIZE:
+            raise ValueError(f"Expected {self.KEY_SIZE}-byte key, got {len(raw_key)}")
+        return raw_key
     
     def _get_or_create_key(self) -> bytes:
-        """Generate or load encryption key"""
-        if self.key_file.exists():
-            try:
-                with open(self.key_file, 'rb') as f:
-                    key = f.read()
-                # Validate key format
-                Fernet(key)  # Will raise if invalid
-                logger.info("Loaded existing encryption key")
-                return key
-            except Exception as e:
-                logger.error(f"Invalid encryption key file: {e}")
-                raise EncryptionError(f"Corrupt encryption key: {e}")
-        else:
-            # Generate new key
-            key = Fernet.generate_key()
+        """
+        Generate or load encryption key
+        
+        The key file holds 32 random bytes, urlsafe-base64 encoded. This is the
+        same format as the Fernet keys used previously, so existing key files
+        keep working (and can still decrypt legacy Fernet data).
+        """
+        try:
+            return self._read_key()
+        except FileNotFoundError:
+            pass
+        
+        # Generate new key
+        key = base64.urlsafe_b64encode(AESGCM.generate_key(bit_length=self.KEY_SIZE * 8))
+        try:
+            # O_EXCL: fail rather than reuse a file another process is creating;
+            # mode applies at creation, so the key is never world-readable
+            fd = os.open(self.key_file, os.O_CREAT | os.O_WRONLY | os.O_EXCL | _O_BINARY, 0o600)
+        except FileExistsError:
+            # Lost the creation race; use the key the other writer created
+            return self._read_key()
+        except Exception as e:
+            logger.error(f"Failed to create key file: {e}")
+            raise EncryptionError(f"Cannot create key file: {e}")
+        try:
+            if os.write(fd, key) != len(key):
+                raise OSError("Short write to key file")
+            os.fsync(fd)
+        except BaseException as e:
+            # Never leave an empty/partial key behind: later starts would treat it as corrupt
+            os.close(fd)
             try:
-                # Write with restricted permissions
-                self.key_file.touch(mode=0o600)  # Owner read/write only
-                with open(self.key_file, 'wb') as f:
-                    f.write(key)
-                logger.info("Generated new encryption key")
-                return key
-            except Exception as e:
+                os.unlink(self.key_file)
+            except OSError:
+                pass
+            if isinstance(e, Exception):
                 logger.error(f"Failed to create key file: {e}")
-                raise EncryptionError(f"Cannot create key file: {e}")
+                raise EncryptionError(f"Cannot create key file: {e}") from e
+            raise
+        os.close(fd)
+        logger.info("Generated new encryption key")
+        return key
+    
+    def _read_key(self) -> bytes:
+        """
+        Read and validate the existing key file
+        
+        Raises:
+            FileNotFoundError: If the key file does not exist
+            EncryptionError: If the key file is unreadable or corrupt
+        """
+        try:
+            fd = os.open(self.key_file, os.O_RDONLY | _O_BINARY)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            logger.error(f"Invalid encryption key file: {e}")
+            raise EncryptionError(f"Corrupt encryption key: {e}")
+        try:
+            key = os.read(fd, 4096).strip()
+            # Validate key format
+            self._decode_key(key)  # Will raise if invalid
+        except Exception as e:
+            logger.error(f"Invalid encryption key file: {e}")
+            raise EncryptionError(f"Corrupt encryption key: {e}")
+        finally:
+            os.close(fd)
+        logger.info("Loaded existing encryption key")
+        return key
     
     @property
-    def cipher(self) -> Fernet:
-        """Get Fernet cipher instance (lazy loading)"""
-        if self._cipher is None:
-            key = self._get_or_create_key()
-            self._cipher = Fernet(key)
+    def cipher(self) -> AESGCM:
+        """Get AES-GCM cipher instance"""
         return self._cipher
     
     def encrypt_dict(self, data: Dict) -> bytes:
@@ -70,20 +150,31 @@ class KeyManager:
             data: Dictionary to encrypt
             
         Returns:
-            Encrypted bytes
+            Encrypted bytes (12-byte nonce followed by ciphertext and tag)
             
         Raises:
             EncryptionError: If encryption fails
         """
         try:
-            json_data = json.dumps(data, ensure_ascii=False)
-            encrypted = self.cipher.encrypt(json_data.encode('utf-8'))
+            nonce = os.urandom(self.NONCE_SIZE)
+            encrypted = nonce + self._cipher.encrypt(nonce, _json_dumps(data), None)
             logger.debug("Data encrypted successfully")
             return encrypted
         except Exception as e:
             logger.error(f"Encryption failed: {e}")
             raise EncryptionError(f"Encryption failed: {e}")
     
+    def _decrypt_legacy(self, encrypted_data: bytes) -> bytes:
+        """Decrypt data written by the previous Fernet implementation"""
+        if self._legacy_cipher is None:
+            self._legacy_cipher = Fernet(self._key)
+        try:
+            decrypted = self._legacy_cipher.decrypt(encrypted_data)
+        except (InvalidToken, ValueError):
+            raise InvalidTag()
+        logger.info("Decrypted legacy Fernet data (re-encrypted with AES-GCM on next save)")
+        return decrypted
+    
     def decrypt_dict(self, encrypted_data: bytes) -> Dict:
         """
         Decrypt data back to dictionary
@@ -98,12 +189,16 @@ class KeyManager:
             EncryptionError: If decryption fails
         """
         try:
-            decrypted = self.cipher.decrypt(encrypted_data)
-            data = json.loads(decrypted.decode('utf-8'))
+            nonce, ciphertext = encrypted_data[:self.NONCE_SIZE], encrypted_data[self.NONCE_SIZE:]
+            try:
+                decrypted = self._cipher.decrypt(nonce, ciphertext, None)
+            except (InvalidTag, ValueError):
+                decrypted = self._decrypt_legacy(encrypted_data)
+            data = _json_loads(decrypted)
             logger.debug("Data decrypted successfully")
             return data
-        except InvalidToken:
-            logger.error("Decryption failed: Invalid token")
+        except InvalidTag:
+            logger.error("Decryption failed: Invalid authentication tag")
             raise EncryptionError("Invalid encryption key or corrupted data")
         except json.JSONDecodeError as e:
             logger.error(f"Decrypted data is not valid JSON: {e}")
@@ -133,10 +228,7 @@ class KeyManager:
         self.key_file.rename(old_key_file)
         logger.info("Backed up old key")
         
-        # Reset cipher to generate new key
-        self._cipher = None
-        new_key = self._get_or_create_key()
-        self._cipher = Fernet(new_key)
+        self._load_ciphers()
         
         # Re-encrypt data
         if old_data:
@@ -147,6 +239,17 @@ class KeyManager:
         logger.info("Key rotation completed successfully")
 
 
+# Serializes first-time key loading/creation across threads
+_KEY_FILE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=16)
+def _get_key_manager(key_file: str) -> KeyManager:
+    """Get the shared KeyManager for a key file path (key read and cipher built once)"""
+    with _KEY_FILE_LOCK:
+        return KeyManager(Path(key_file))
+
+
 class SecureConfigManager:
     """Manage encrypted configuration"""
     
@@ -154,7 +257,19 @@ class SecureConfigManager:
                  config_file: Path = CONFIG_FILE,
                  key_manager: Optional[KeyManager] = None):
         self.config_file = config_file
-        self.key_manager = key_manager or KeyManager()
+        self._key_manager = key_manager
+    
+    @property
+    def key_manager(self) -> KeyManager:
+        """
+        KeyManager, resolved on first use
+        
+        Loading the key lazily keeps a corrupt or unreadable key file from failing
+        construction at app startup; load() and save() handle EncryptionError.
+        """
+        if self._key_manager is None:
+            self._key_manager = _get_key_manager(str(KEY_FILE))
+        return self._key_manager
     
     def save(self, config: Dict) -> bool:
         """
@@ -190,6 +305,22 @@ class SecureConfigManager:
             logger.error(f"Failed to save configuration: {e}")
             return False
     
+    def update(self, changes: Dict) -> bool:
+        """
+        Merge changed fields into the stored configuration and save it
+        
+        The whole config is re-encrypted once as a single blob, however many
+        fields change.
+        
+        Args:
+            changes: Fields to set (None values are dropped on save)
+            
+        Returns:
+            True if successful
+        """
+        # Copy so the cached config dict is not mutated if the save fails
+        return self.save({**self.load(), **changes})
+    
     def _clear_config_cache(self):
         """Clear cached configuration data"""
         try:
@@ -279,20 +410,22 @@ class SecureConfigManager:
             return False
 
 
+@lru_cache(maxsize=256)
 def hash_api_key(api_key: str) -> str:
     """
     Create a hash of API key for logging/debugging without exposing the key
     
+    Pure function, memoized since the same keys are hashed on every rerun.
+    
     Args:
         api_key: The API key to hash
         
     Returns:
-        Short hash string (first 8 chars of SHA256)
+        Short hash string (8 hex chars of a 4-byte BLAKE2b digest)
     """
     if not api_key:
         return "empty"
-    hash_obj = hashlib.sha256(api_key.encode())
-    return hash_obj.hexdigest()[:8]
+    return hashlib.blake2b(api_key.encode('utf-8'), digest_size=4).hexdigest()
 
 
 def generate_secure_token(length: int = 32) -> str:
@@ -300,6 +433,7 @@ def generate_secure_token(length: int = 32) -> str:
     return secrets.token_urlsafe(length)
 
 
+@lru_cache(maxsize=256)
 def mask_api_key(api_key: str, visible_chars: int = 4) -> str:
     """
     Mask API key for display
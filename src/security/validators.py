@@ -4,14 +4,20 @@ Validates and sanitizes user inputs to prevent security vulnerabilities
 """
 
 import re
-from typing import Optional, Tuple
-from urllib.parse import urlparse
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
 import html
 
 from src.config import get_logger
 
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = get_logger(__name__)
 
+# C0 control characters (NUL etc.) removed by sanitize_text; tab/newline/CR are kept
+_SANITIZE_TABLE = str.maketrans({chr(c): None for c in range(32) if c not in (9, 10, 13)})
+
 
 class ValidationError(Exception):
     """Custom exception for validation errors"""
@@ -21,15 +27,11 @@ class ValidationError(Exception):
 class InputValidator:
     """Secure input validation"""
     
-    # Patterns
-    URL_PATTERN = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain
-        r'localhost|'  # localhost
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # or IP
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE
-    )
+    # URL checks (urlsplit + character-class tests, no backtracking regex)
+    URL_SCHEMES = ('http', 'https')
+    _HOST_LABEL_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789-')
+    _NETLOC_RE = re.compile(r'[A-Za-z0-9.-]+(?::\d+)?\Z')  # host[:port], disjoint classes
+    _WHITESPACE_RE = re.compile(r'\s')
     
     EMAIL_PATTERN = re.compile(
         r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
@@ -42,6 +44,39 @@ class InputValidator:
         re.compile(r'on\w+\s*=', re.IGNORECASE),  # onclick, onerror, etc.
         re.compile(r'<iframe', re.IGNORECASE),
     ]
+    # All dangerous patterns in one alternation (single scan per input)
+    _DANGEROUS_RE = re.compile(
+        '|'.join(f'(?:{p.pattern})' for p in DANGEROUS_PATTERNS), re.IGNORECASE
+    )
+    
+    @staticmethod
+    def _is_valid_host(host: str) -> bool:
+        """Check hostname is a domain name, localhost or dotted IPv4 address (linear time)"""
+        if host == 'localhost':
+            return True
+        
+        labels = host.split('.')
+        
+        # Dotted IPv4 (1-3 digits per part)
+        if len(labels) == 4 and all(label.isdigit() and len(label) <= 3 for label in labels):
+            return all(label.isascii() for label in labels)
+        
+        # Domain: optional trailing dot, alphabetic TLD of 2-6 chars
+        if labels[-1] == '':
+            labels.pop()
+        if len(labels) < 2:
+            return False
+        
+        tld = labels[-1]
+        if not (2 <= len(tld) <= 6 and tld.isascii() and tld.isalpha()):
+            return False
+        
+        return all(
+            0 < len(label) <= 63
+            and label[0] != '-' and label[-1] != '-'
+            and InputValidator._HOST_LABEL_CHARS.issuperset(label)
+            for label in labels[:-1]
+        )
     
     @staticmethod
     def validate_url(url: str, require_https: bool = False) -> Tuple[bool, str]:
@@ -61,24 +96,39 @@ class InputValidator:
         # Trim whitespace
         url = url.strip()
         
+        # Cheap rejects before parsing (e.g. free text like "not a url")
+        if not url or ' ' in url or '\n' in url or '\t' in url:
+            return False, "Invalid URL format"
+        
         # Add protocol if missing
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
         
-        # Check pattern
-        if not InputValidator.URL_PATTERN.match(url):
-            return False, "Invalid URL format"
-        
         # Parse URL
         try:
-            parsed = urlparse(url)
+            parsed = urlsplit(url)
+            
+            # Check format: scheme, host[:port], then nothing or a path/query; no whitespace
+            after_netloc = url[len(parsed.scheme) + 3 + len(parsed.netloc):]
+            if (parsed.scheme not in InputValidator.URL_SCHEMES
+                    or not InputValidator._NETLOC_RE.match(parsed.netloc)
+                    or after_netloc[:1] not in ('', '/', '?')
+                    or after_netloc == '?'  # A bare '?' needs a query after it
+                    or not parsed.hostname
+                    or not InputValidator._is_valid_host(parsed.hostname)
+                    or InputValidator._WHITESPACE_RE.search(url)):
+                return False, "Invalid URL format"
+            try:
+                parsed.port  # Raises on a non-numeric or out-of-range port
+            except ValueError:
+                return False, "Invalid URL format"
             
             # Check for HTTPS if required
             if require_https and parsed.scheme != 'https':
                 return False, "Only HTTPS URLs are allowed"
             
             # Check for suspicious patterns
-            if any(pattern.search(url) for pattern in InputValidator.DANGEROUS_PATTERNS):
+            if InputValidator._DANGEROUS_RE.search(url):
                 logger.warning(f"Dangerous pattern detected in URL: {url}")
                 return False, "URL contains potentially dangerous content"
             
@@ -93,7 +143,8 @@ class InputValidator:
             return True, url
             
         except Exception as e:
-            logger.error(f"URL parsing error: {e}")
+            # e.g. malformed IPv6 brackets: ordinary invalid input, not an application error
+            logger.debug(f"URL parsing error: {e}")
             return False, f"URL parsing failed: {str(e)}"
     
     @staticmethod
@@ -120,10 +171,6 @@ class InputValidator:
         if ' ' in api_key:
             return False, "API key contains invalid whitespace"
         
-        # Check for common prefixes
-        valid_prefixes = ['sk-', 'fc-', 'Bearer ', 'pk-']
-        # Allow keys without prefix too
-        
         logger.debug("API key format validated")
         return True, "Valid"
     
@@ -158,11 +205,8 @@ class InputValidator:
         # Convert to string if not already
         text = str(text)
         
-        # Escape HTML
-        text = html.escape(text)
-        
-        # Remove null bytes
-        text = text.replace('\x00', '')
+        # Strip control characters, then escape HTML (both single C-level passes)
+        text = html.escape(text.translate(_SANITIZE_TABLE))
         
         # Truncate if needed
         if max_length and len(text) > max_length:
@@ -204,6 +248,30 @@ class InputValidator:
         
         return True, "Valid"
     
+    @staticmethod
+    def validate_scores(scores: Sequence) -> 'np.ndarray':
+        """
+        Validate many lead scores at once (vectorized validate_score)
+        
+        Args:
+            scores: Sequence of scores, e.g. the lead_score values of a leads file
+            
+        Returns:
+            Boolean mask, True where validate_score would accept the score
+        """
+        import numpy as np  # Only needed for bulk validation
+        
+        values = np.asarray(scores)
+        if np.issubdtype(values.dtype, np.integer):
+            return (values >= 0) & (values <= 100)
+        
+        # Non-integer or mixed input (None, strings, floats): apply the scalar rules per item
+        return np.fromiter(
+            (InputValidator.validate_score(score)[0] for score in scores),
+            dtype=bool,
+            count=len(values)
+        )
+    
     @staticmethod
     def validate_file_path(path: str, allowed_extensions: Optional[list] = None) -> Tuple[bool, str]:
         """
@@ -230,7 +298,7 @@ class InputValidator:
         
         # Check extension if specified
         if allowed_extensions:
-            if not any(path.endswith(ext) for ext in allowed_extensions):
+            if not path.endswith(tuple(allowed_extensions)):
                 return False, f"File extension must be one of: {', '.join(allowed_extensions)}"
         
         return True, "Valid"
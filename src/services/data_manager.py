@@ -4,13 +4,14 @@ Handles lead data persistence with JSON storage
 """
 
 import json
+from collections import Counter
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime, timedelta
 
 from src.config import LEADS_FILE, get_logger, AppConfig
 from src.models.lead import Lead
-from src.security import SecureConfigManager
+from src.security import SecureConfigManager, InputValidator
 
 logger = get_logger(__name__)
 
@@ -23,6 +24,9 @@ class DataManagerError(Exception):
 class DataManager:
     """Manages lead data persistence"""
     
+    # Demonstration leads use IDs from this value upwards
+    TEST_LEAD_MIN_ID = 9000
+    
     def __init__(self, data_file: Path = LEADS_FILE):
         """
         Initialize DataManager
@@ -33,6 +37,7 @@ class DataManager:
         self.data_file = data_file
         self._ensure_file_exists()
         self._config_manager = SecureConfigManager()
+        self._has_test_leads: Optional[bool] = None
         
         logger.info(f"DataManager initialized (file: {self.data_file})")
     
@@ -186,6 +191,16 @@ Best regards,
             # If we can't determine config, assume test mode
             return True
     
+    def _update_test_flag(self, leads: List[Lead]):
+        """Record whether the given (loaded or saved) leads include test leads"""
+        self._has_test_leads = any(lead.id and lead.id >= self.TEST_LEAD_MIN_ID for lead in leads)
+    
+    def has_test_leads(self) -> bool:
+        """Whether the current leads include test leads (tracked on load/save, no per-call scan)"""
+        if self._has_test_leads is None:
+            self.load_all(use_cache=False)
+        return self._has_test_leads
+    
     def _clear_cache(self):
         """Clear cached leads data"""
         try:
@@ -227,7 +242,11 @@ Best regards,
             with open(self.data_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            leads = [Lead.from_dict(item) for item in data]
+            # One bad score would make Lead() raise and drop the whole file, so skip those records
+            valid = InputValidator.validate_scores([item.get('lead_score') for item in data])
+            if not valid.all():
+                logger.warning(f"Skipping {int((~valid).sum())} stored leads with invalid scores")
+            leads = [Lead.from_dict(item) for item, ok in zip(data, valid) if ok]
             
             # If no real leads and in test mode, return test data
             if len(leads) == 0 and self._is_test_mode():
@@ -237,6 +256,8 @@ Best regards,
             else:
                 logger.info(f"Loaded {len(leads)} leads from storage")
             
+            self._update_test_flag(leads)
+            
             # Cache the results
             if use_cache:
                 import streamlit as st
@@ -252,7 +273,9 @@ Best regards,
             if self._is_test_mode():
                 test_leads = self._get_test_leads()
                 logger.info(f"Data file corrupted, using test data: {len(test_leads)} test leads")
+                self._has_test_leads = True
                 return test_leads
+            self._has_test_leads = False
             return []
         except Exception as e:
             logger.error(f"Error loading leads: {e}", exc_info=True)
@@ -260,7 +283,9 @@ Best regards,
             if self._is_test_mode():
                 test_leads = self._get_test_leads()
                 logger.info(f"Error loading data, using test data: {len(test_leads)} test leads")
+                self._has_test_leads = True
                 return test_leads
+            self._has_test_leads = False
             return []
     
     def save_all(self, leads: List[Lead]) -> bool:
@@ -284,6 +309,7 @@ Best regards,
             
             # Replace original file
             temp_file.replace(self.data_file)
+            self._update_test_flag(leads)
             
             # Clear cache after data change
             self._clear_cache()
@@ -307,8 +333,10 @@ Best regards,
         """
         leads = self.load_all()
         
-        # Assign ID
-        lead.id = len(leads) + 1
+        # Assign ID after the highest real ID (len() would reuse IDs after deletes or skipped records)
+        lead.id = max(
+            (l.id for l in leads if l.id and l.id < self.TEST_LEAD_MIN_ID), default=0
+        ) + 1
         lead.timestamp = datetime.now().isoformat()
         
         leads.append(lead)
@@ -422,9 +450,7 @@ Best regards,
         qualified = sum(1 for l in leads if l.is_qualified)
         
         # Count by industry
-        industries = {}
-        for lead in leads:
-            industries[lead.industry] = industries.get(lead.industry, 0) + 1
+        industries = dict(Counter(lead.industry for lead in leads))
         
         stats = {
             'total': len(leads),
@@ -4,6 +4,7 @@ Handles document ingestion, embedding, and semantic search using RAG
 """
 
 import os
+import threading
 import uuid
 import hashlib
 from pathlib import Path
@@ -19,13 +20,18 @@ import docx
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
-from langchain_core.documents import Document as LangChainDocument
 
 from src.config import get_logger, Constants
 from src.models.document import Document
 
 logger = get_logger(__name__)
 
+# Serializes metadata read-merge-write cycles across sessions (Streamlit sessions are threads)
+_METADATA_LOCK = threading.Lock()
+
+# Translation table for flattening whitespace in document summaries
+_NL_TO_SPACE = str.maketrans('\n\r\t', '   ')
+
 
 class KnowledgeBaseError(Exception):
     """Custom exception for knowledge base errors"""
@@ -38,6 +44,12 @@ class KnowledgeBaseService:
     Handles document ingestion, chunking, embedding, and semantic search
     """
     
+    # Text splitter defaults (one splitter instance is shared by all services)
+    CHUNK_SIZE = 1000
+    CHUNK_OVERLAP = 200
+    SEPARATORS = ["\n\n", "\n", " ", ""]
+    _shared_text_splitter: Optional[RecursiveCharacterTextSplitter] = None
+    
     def __init__(self, persist_directory: str = "data/chroma_db", 
                  documents_directory: str = "data/documents"):
         """
@@ -64,18 +76,30 @@ class KnowledgeBaseService:
         )
         
         # Initialize text splitter
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""]
-        )
+        self.text_splitter = self._get_text_splitter()
         
         # Initialize or load vector store
         self.vector_store = self._initialize_vector_store()
         
+        # In-memory document index (doc_id -> Document), reloaded when the metadata file changes
+        self._index_mtime: Optional[int] = None
+        self._doc_index: Dict[str, Document] = {}
+        self._sync_document_index()
+        
         logger.info("Knowledge Base Service initialized")
     
+    @classmethod
+    def _get_text_splitter(cls) -> RecursiveCharacterTextSplitter:
+        """Get the shared text splitter, creating it on first use"""
+        if cls._shared_text_splitter is None:
+            cls._shared_text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=cls.CHUNK_SIZE,
+                chunk_overlap=cls.CHUNK_OVERLAP,
+                length_function=len,
+                separators=cls.SEPARATORS
+            )
+        return cls._shared_text_splitter
+    
     def _initialize_vector_store(self) -> Chroma:
         """Initialize or load existing ChromaDB vector store"""
         try:
@@ -179,22 +203,26 @@ class KnowledgeBaseService:
             chunks = self.text_splitter.split_text(text)
             logger.info(f"Split document into {len(chunks)} chunks")
             
-            # Create LangChain documents with metadata
-            langchain_docs = []
-            for i, chunk in enumerate(chunks):
-                langchain_docs.append(LangChainDocument(
-                    page_content=chunk,
-                    metadata={
-                        "source": filename,
-                        "doc_id": doc_id,
-                        "chunk_index": i,
-                        "doc_type": doc_type
-                    }
-                ))
+            # Chunk metadata
+            metadatas = [
+                {
+                    "source": filename,
+                    "doc_id": doc_id,
+                    "chunk_index": i,
+                    "doc_type": doc_type
+                }
+                for i in range(len(chunks))
+            ]
             
-            # Add to vector store
-            self.vector_store.add_documents(langchain_docs)
-            # Note: langchain-chroma persists automatically
+            # Embed all chunks in one batch and add them to the collection in a single call
+            embeddings = self.embeddings.embed_documents(chunks)
+            self.vector_store._collection.add(
+                ids=self._chunk_ids(doc_id, len(chunks)),
+                embeddings=embeddings,
+                documents=chunks,
+                metadatas=metadatas
+            )
+            # Note: chromadb persists automatically
             
             # Calculate metrics
             char_count = len(text)
@@ -209,14 +237,17 @@ class KnowledgeBaseService:
             last_modified = datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
             
             # Generate summary (first 200 chars)
-            summary = text[:200].replace('\n', ' ').strip()
+            summary = text[:200].translate(_NL_TO_SPACE).strip()
             if len(text) > 200:
                 summary += "..."
             
+            # Store preview (first 1000 chars)
+            preview = text if len(text) <= 1000 else text[:1000] + "..."
+            
             # Create Document object
             document = Document(
                 filename=filename,
-                content=text[:1000] + "..." if len(text) > 1000 else text,  # Store preview
+                content=preview,
                 doc_type=doc_type,
                 file_size=file_path.stat().st_size,
                 num_chunks=len(chunks),
@@ -300,26 +331,56 @@ class KnowledgeBaseService:
         context = "\n\n".join(context_parts)
         return context
     
-    def list_documents(self) -> List[Document]:
-        """
-        List all documents in knowledge base
-        
-        Returns:
-            List of Document objects
-        """
+    def _load_document_index(self) -> Dict[str, Document]:
+        """Load document metadata from disk into an index keyed by document ID"""
         try:
             if not self.metadata_file.exists():
-                return []
+                return {}
             
             with open(self.metadata_file, 'r', encoding='utf-8') as f:
                 metadata_list = json.load(f)
             
-            documents = [Document.from_dict(meta) for meta in metadata_list]
-            return documents
+            # Skip bad entries individually so one of them doesn't hide every document
+            index = {}
+            for meta in metadata_list:
+                try:
+                    doc = Document.from_dict(meta)
+                except Exception as e:
+                    logger.warning(f"Skipping malformed document metadata entry: {e}")
+                    continue
+                if not doc.id:
+                    logger.warning(f"Skipping document metadata entry without an ID: {doc.filename}")
+                    continue
+                index[doc.id] = doc
+            return index
             
         except Exception as e:
-            logger.error(f"Error listing documents: {e}")
-            return []
+            logger.error(f"Error loading document metadata: {e}")
+            return {}
+    
+    def _metadata_mtime(self) -> Optional[int]:
+        """Modification time of the metadata file in ns (None if missing)"""
+        try:
+            return self.metadata_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _sync_document_index(self):
+        """Reload the index if another session changed the metadata file (one stat otherwise)"""
+        mtime = self._metadata_mtime()
+        if mtime != self._index_mtime:
+            self._doc_index = self._load_document_index()
+            self._index_mtime = mtime
+    
+    def list_documents(self) -> List[Document]:
+        """
+        List all documents in knowledge base
+        
+        Returns:
+            List of Document objects
+        """
+        self._sync_document_index()
+        return list(self._doc_index.values())
     
     def delete_document(self, doc_id: str) -> Tuple[bool, str]:
         """
@@ -332,24 +393,20 @@ class KnowledgeBaseService:
             Tuple of (success, message)
         """
         try:
+            self._sync_document_index()
+            doc_to_delete = self._doc_index.get(doc_id)
+            
             # Delete from vector store
-            self.vector_store.delete(where={"doc_id": doc_id})
-            # Note: langchain-chroma persists automatically
+            self._delete_chunks(doc_id, doc_to_delete.num_chunks if doc_to_delete else 0)
+            # Note: chromadb persists automatically
             
             # Delete file
-            documents = self.list_documents()
-            doc_to_delete = None
-            for doc in documents:
-                if doc.id == doc_id:
-                    doc_to_delete = doc
-                    if doc.file_path and Path(doc.file_path).exists():
-                        Path(doc.file_path).unlink()
-                    break
-            
             if doc_to_delete:
+                if doc_to_delete.file_path and Path(doc_to_delete.file_path).exists():
+                    Path(doc_to_delete.file_path).unlink()
+                
                 # Update metadata
-                documents.remove(doc_to_delete)
-                self._save_all_documents_metadata(documents)
+                self._update_metadata(remove_id=doc_id)
                 
                 logger.info(f"Deleted document: {doc_id}")
                 return True, "Document deleted successfully"
@@ -360,6 +417,22 @@ class KnowledgeBaseService:
             logger.error(f"Error deleting document: {e}")
             return False, f"Error deleting document: {str(e)}"
     
+    @staticmethod
+    def _chunk_ids(doc_id: str, num_chunks: int) -> List[str]:
+        """Build deterministic vector store IDs for a document's chunks"""
+        return [f"{doc_id}:{i}" for i in range(num_chunks)]
+    
+    def _delete_chunks(self, doc_id: str, num_chunks: int):
+        """Delete a document's chunks from the vector store"""
+        collection = self.vector_store._collection
+        chunk_ids = self._chunk_ids(doc_id, num_chunks)
+        
+        if chunk_ids and collection.get(ids=chunk_ids[:1])['ids']:
+            collection.delete(ids=chunk_ids)
+        else:
+            # Documents indexed before deterministic chunk IDs need a metadata lookup
+            collection.delete(where={"doc_id": doc_id})
+    
     def get_stats(self) -> Dict:
         """Get knowledge base statistics with enhanced metrics"""
         documents = self.list_documents()
@@ -391,15 +464,33 @@ class KnowledgeBaseService:
     
     def _save_document_metadata(self, document: Document):
         """Save single document metadata"""
-        documents = self.list_documents()
-        documents.append(document)
-        self._save_all_documents_metadata(documents)
+        self._update_metadata(upsert=document)
+    
+    def _update_metadata(self, upsert: Optional[Document] = None, remove_id: Optional[str] = None):
+        """
+        Apply one change to the metadata file and refresh the in-memory index
+        
+        The file is re-read under a lock before writing, so documents added or
+        deleted by other sessions since this index was loaded are kept.
+        """
+        with _METADATA_LOCK:
+            index = self._load_document_index()
+            if upsert is not None:
+                index[upsert.id] = upsert
+            if remove_id is not None:
+                index.pop(remove_id, None)
+            
+            self._save_all_documents_metadata(list(index.values()))
+            self._doc_index = index
+            self._index_mtime = self._metadata_mtime()
     
     def _save_all_documents_metadata(self, documents: List[Document]):
-        """Save all documents metadata"""
+        """Save all documents metadata (atomic replace)"""
         try:
             metadata_list = [doc.to_dict() for doc in documents]
-            with open(self.metadata_file, 'w', encoding='utf-8') as f:
+            temp_file = self.metadata_file.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(metadata_list, f, indent=2)
+            temp_file.replace(self.metadata_file)
         except Exception as e:
             logger.error(f"Error saving metadata: {e}")
@@ -3,7 +3,9 @@ Lead Analyzer Service
 Orchestrates the complete lead analysis workflow with RAG integration
 """
 
-from typing import Dict, Tuple, Optional
+from typing import Callable, Dict, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import time
 
 from src.config import AppConfig, Constants, get_logger
@@ -202,16 +204,24 @@ class LeadAnalyzer:
     
     def analyze_bulk_urls(self, 
                           urls: list, 
-                          delay: float = None) -> list[Dict]:
+                          delay: float = None,
+                          progress_callback: Optional[Callable[[int, int, str], None]] = None) -> list[Dict]:
         """
-        Analyze multiple URLs with rate limiting
+        Analyze multiple URLs concurrently with rate limiting
+        
+        Scraping and AI analysis run in a thread pool (config.bulk_max_workers);
+        request starts are spaced by `delay` inside the workers. Leads are saved
+        sequentially on the calling thread, since DataManager writes are not
+        thread-safe.
         
         Args:
             urls: List of URLs to analyze
-            delay: Delay between requests (uses config default if None)
+            delay: Delay between request starts (uses config default if None)
+            progress_callback: Optional callable(done, total, url), called on the
+                calling thread as each URL completes
             
         Returns:
-            List of result dictionaries
+            List of result dictionaries (in input order)
         """
         if delay is None:
             delay = self.config.rate_limit_delay
@@ -221,23 +231,49 @@ class LeadAnalyzer:
             logger.warning(f"Bulk request too large, limiting to {Constants.MAX_BULK_URLS}")
             urls = urls[:Constants.MAX_BULK_URLS]
         
-        results = []
+        # Rate limiting: each worker reserves the next start slot, then sleeps until it
+        pace_lock = threading.Lock()
+        next_start = time.monotonic()
         
-        for idx, url in enumerate(urls, 1):
-            logger.info(f"Processing {idx}/{len(urls)}: {url}")
-            
-            success, message, lead_id = self.analyze_and_save(url)
-            
-            results.append({
-                'url': url,
-                'success': success,
-                'message': message,
-                'lead_id': lead_id
-            })
+        def paced_analyze(url: str) -> Tuple[bool, str, Lead]:
+            nonlocal next_start
+            with pace_lock:
+                now = time.monotonic()
+                start = max(next_start, now)
+                next_start = start + delay
+            if start > now:
+                time.sleep(start - now)
+            return self.analyze_single_url(url)
+        
+        results = [None] * len(urls)
+        
+        with ThreadPoolExecutor(max_workers=self.config.bulk_max_workers) as executor:
+            futures = {executor.submit(paced_analyze, url): idx for idx, url in enumerate(urls)}
             
-            # Rate limiting
-            if idx < len(urls):
-                time.sleep(delay)
+            for done, future in enumerate(as_completed(futures), 1):
+                idx = futures[future]
+                url = urls[idx]
+                logger.info(f"Processed {done}/{len(urls)}: {url}")
+                
+                lead_id = None
+                try:
+                    success, message, lead = future.result()
+                    if success:
+                        lead_id = self.data_manager.add_lead(lead)
+                        message = f"Lead #{lead_id} saved successfully"
+                except Exception as e:
+                    logger.error(f"Bulk analysis failed for {url}: {e}")
+                    success, message = False, f"Error: {str(e)}"
+                
+                results[idx] = {
+                    'url': url,
+                    'success': success,
+                    'message': message,
+                    'lead_id': lead_id
+                }
+                
+                if progress_callback:
+                    progress_callback(done, len(urls), url)
         
         successful = sum(1 for r in results if r['success'])
         logger.info(f"Bulk analysis complete: {successful}/{len(urls)} successful")
@@ -4,6 +4,8 @@ from src.ui.components.charts import (
     render_hero_section,
     render_workflow_cards,
     render_lead_card,
+    LeadStats,
+    aggregate_leads,
     create_pie_chart,
     create_score_histogram,
     create_industry_bar_chart,
@@ -19,6 +21,8 @@ __all__ = [
     'render_hero_section',
     'render_workflow_cards',
     'render_lead_card',
+    'LeadStats',
+    'aggregate_leads',
     'create_pie_chart',
     'create_score_histogram',
     'create_industry_bar_chart',
@@ -3,39 +3,80 @@ Streamlit UI Components
 Reusable UI components for the application
 """
 
+import html
+from urllib.parse import urlsplit
+
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
-from typing import List
+import numpy as np
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Union
 
 from src.models.lead import Lead
 from src.config import Constants
+from src.security.validators import InputValidator
+
+
+_HERO_CSS = """
+<style>
+.hero-section {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 3rem;
+    border-radius: 10px;
+    color: white;
+    text-align: center;
+    margin-bottom: 2rem;
+}
+.hero-title {
+    font-size: 3rem;
+    font-weight: bold;
+    margin-bottom: 1rem;
+}
+.hero-subtitle {
+    font-size: 1.3rem;
+    opacity: 0.9;
+}
+</style>
+"""
+
+_WORKFLOW_CSS = """
+<style>
+.workflow-card {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 1.5rem;
+    border-radius: 10px;
+    border-left: 4px solid rgba(255, 255, 255, 0.5);
+    margin: 1rem 0;
+    color: white;
+}
+.workflow-number {
+    background: rgba(255, 255, 255, 0.3);
+    color: white;
+    border-radius: 50%;
+    width: 40px;
+    height: 40px;
+    display: inline-flex;
+    align-items: center;
+    justify-content: center;
+    font-weight: bold;
+    font-size: 1.2rem;
+    margin-right: 1rem;
+}
+.workflow-card strong {
+    color: white;
+}
+</style>
+"""
 
 
 def render_hero_section():
     """Render hero section with gradient background"""
+    # Styles are emitted with the component each run (Streamlit drops elements not re-sent)
+    st.markdown(_HERO_CSS, unsafe_allow_html=True)
     st.markdown("""
-    <style>
-    .hero-section {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 3rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .hero-title {
-        font-size: 3rem;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
-    .hero-subtitle {
-        font-size: 1.3rem;
-        opacity: 0.9;
-    }
-    </style>
-    
     <div class="hero-section">
         <div class="hero-title"> AI Lead Automator</div>
         <div class="hero-subtitle">
@@ -48,35 +89,7 @@ def render_hero_section():
 
 def render_workflow_cards():
     """Render workflow explanation cards"""
-    st.markdown("""
-    <style>
-    .workflow-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 4px solid rgba(255, 255, 255, 0.5);
-        margin: 1rem 0;
-        color: white;
-    }
-    .workflow-number {
-        background: rgba(255, 255, 255, 0.3);
-        color: white;
-        border-radius: 50%;
-        width: 40px;
-        height: 40px;
-        display: inline-flex;
-        align-items: center;
-        justify-content: center;
-        font-weight: bold;
-        font-size: 1.2rem;
-        margin-right: 1rem;
-    }
-    .workflow-card strong {
-        color: white;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
+    st.markdown(_WORKFLOW_CSS, unsafe_allow_html=True)
     col1, col2 = st.columns(2)
     
     with col1:
@@ -108,108 +121,271 @@ def render_workflow_cards():
         """, unsafe_allow_html=True)
 
 
-def render_lead_card(lead: Lead):
-    """Render a single lead card with styling"""
+def _escape_html(value) -> str:
+    """Escape text for HTML (model text fields may already hold entities, so unescape first)"""
+    return html.escape(html.unescape(str(value)))
+
+
+def _lead_card_markdown(lead: Lead) -> str:
+    """Build the lead card header and analysis markup with all lead fields escaped"""
     color = lead.score_color
+    url = _escape_html(lead.url)
     
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, #{color}22 0%, #{color}11 100%); 
-                padding: 1rem; border-radius: 10px; border-left: 4px solid {color};">
-        <h3>{lead.company_name}</h3>
-        <strong>Score:</strong> {lead.lead_score}/100 - {lead.qualification_status}<br>
-        <strong>Industry:</strong> {lead.industry}<br>
-        <strong>URL:</strong> <a href="{lead.url}" target="_blank">{lead.url}</a>
-    </div>
-    """, unsafe_allow_html=True)
+    # Only web URLs become links; anything else (javascript:, data:, ...) is shown as text
+    if urlsplit(html.unescape(lead.url)).scheme.lower() in InputValidator.URL_SCHEMES:
+        url_html = f'<a href="{url}" target="_blank" rel="noopener noreferrer">{url}</a>'
+    else:
+        url_html = url
     
-    st.markdown(f"**Score Rationale:**\n{lead.score_rationale}")
-    st.markdown(f"**Key Insights:**\n{lead.key_insights}")
-    st.markdown(f"**ICP Fit Analysis:**\n{lead.fit_analysis}")
+    return f"""
+<div style="background: linear-gradient(135deg, #{color}22 0%, #{color}11 100%); 
+            padding: 1rem; border-radius: 10px; border-left: 4px solid {color};">
+    <h3>{_escape_html(lead.company_name)}</h3>
+    <strong>Score:</strong> {lead.lead_score}/100 - {lead.qualification_status}<br>
+    <strong>Industry:</strong> {_escape_html(lead.industry)}<br>
+    <strong>URL:</strong> {url_html}
+</div>
+
+**Score Rationale:**
+{_escape_html(lead.score_rationale)}
+
+**Key Insights:**
+{_escape_html(lead.key_insights)}
+
+**ICP Fit Analysis:**
+{_escape_html(lead.fit_analysis)}
+"""
+
+
+def render_lead_card(lead: Lead, key_prefix: str = ""):
+    """
+    Render a single lead card with styling
+    
+    Args:
+        lead: Lead to render
+        key_prefix: Prefix for widget keys when the same lead is rendered twice on a page
+    """
+    # Header and analysis sections in a single element (LLM/scraped text is escaped)
+    st.markdown(_lead_card_markdown(lead), unsafe_allow_html=True)
+    
+    # Draft widgets are only created once the user asks for them; toggles keep
+    # their state across reruns, so the drafts stay open
+    key = f"{key_prefix}{lead.id}"
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        show_email = st.toggle("Show Email Draft", key=f"show_email_{key}")
+    with col2:
+        show_sms = st.toggle("Show SMS Draft", key=f"show_sms_{key}")
     
-    with st.expander("Personalized Email Draft"):
-        st.text_area("Email", value=lead.personalized_email, height=200, 
-                     key=f"email_{lead.id}")
+    if show_email:
+        st.text_area("Personalized Email Draft", value=lead.personalized_email, height=200, 
+                     key=f"email_{key}")
     
-    with st.expander("SMS Draft"):
-        st.text_area("SMS", value=lead.sms_draft, height=80, 
-                     key=f"sms_{lead.id}")
+    if show_sms:
+        st.text_area("SMS Draft", value=lead.sms_draft, height=80, 
+                     key=f"sms_{key}")
 
 
-def create_pie_chart(leads: List[Lead]) -> go.Figure:
-    """Create qualification pie chart"""
-    qualified = sum(1 for l in leads if l.is_qualified)
-    disqualified = len(leads) - qualified
-    
-    fig = go.Figure(data=[go.Pie(
-        labels=['Qualified (≥70)', 'Disqualified (<70)'],
-        values=[qualified, disqualified],
-        hole=0.4,
-        marker_colors=['#10b981', '#ef4444']
-    )])
-    fig.update_layout(height=300, showlegend=True)
-    return fig
-
-
-def create_score_histogram(leads: List[Lead]) -> go.Figure:
-    """Create score distribution histogram"""
-    scores = [l.lead_score for l in leads]
-    
-    fig = px.histogram(
-        x=scores,
-        nbins=10,
-        color_discrete_sequence=['#667eea'],
-        labels={'x': 'Lead Score', 'y': 'Count'}
-    )
-    fig.update_layout(
+# Chart layouts (applied at figure construction)
+_PIE_LAYOUT = dict(height=300, showlegend=True)
+_HISTOGRAM_LAYOUT = dict(
+    height=300,
+    showlegend=False,
+    bargap=0.02,
+    hovermode='x unified',
+    xaxis_title="Lead Score",
+    yaxis_title="Count"
+)
+_INDUSTRY_LAYOUT = dict(
+    height=400,
+    showlegend=False,
+    xaxis_title="Number of Leads",
+    yaxis_title="Industry"
+)
+
+
+# Placeholder for charts with nothing to plot (built once, shared by all builders)
+_EMPTY_FIG = go.Figure(
+    layout=dict(
         height=300,
-        showlegend=False,
-        xaxis_title="Lead Score",
-        yaxis_title="Count"
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False)
     )
-    return fig
+).add_annotation(text="No data", showarrow=False)
 
 
-def create_industry_bar_chart(leads: List[Lead]) -> go.Figure:
-    """Create industry breakdown bar chart"""
-    industries = {}
+@st.cache_data(show_spinner=False)
+def _pie_figure(qualified: int, total: int) -> go.Figure:
+    """Build qualification pie chart (cached on counts)"""
+    return go.Figure(
+        data=[go.Pie(
+            labels=['Qualified (≥70)', 'Disqualified (<70)'],
+            values=[qualified, total - qualified],
+            hole=0.4,
+            marker_colors=['#10b981', '#ef4444'],
+            hoverinfo='skip'
+        )],
+        layout=_PIE_LAYOUT
+    )
+
+
+def _gl_scatter(x, y, **kwargs) -> go.Scattergl:
+    """
+    Build a WebGL scatter trace
+    
+    Any scatter view over leads (e.g. score vs. time) should go through this
+    helper: SVG scatter traces become unresponsive past ~10k points.
+    """
+    return go.Scattergl(x=x, y=y, **kwargs)
+
+
+# Score histogram bins (fixed 0-100 range, 10 bins)
+_SCORE_BINS = 10
+_SCORE_RANGE = (0, 100)
+_SCORE_EDGES = np.linspace(*_SCORE_RANGE, _SCORE_BINS + 1)
+_SCORE_CENTERS = (_SCORE_EDGES[:-1] + _SCORE_EDGES[1:]) / 2
+
+
+@st.cache_data(show_spinner=False)
+def _score_histogram_figure(bin_counts: tuple) -> go.Figure:
+    """Build score distribution histogram from pre-binned counts (cached on counts)"""
+    return go.Figure(
+        go.Bar(
+            x=_SCORE_CENTERS,
+            y=list(bin_counts),
+            width=_SCORE_EDGES[1] - _SCORE_EDGES[0],
+            marker_color='#667eea'
+        ),
+        layout=_HISTOGRAM_LAYOUT
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _industry_bar_figure(top_industries: tuple) -> go.Figure:
+    """Build industry bar chart (cached on (industry, count) pairs)"""
+    # SVG bars are fine here: at most 10 bars after top-10 truncation
+    return go.Figure(
+        go.Bar(
+            x=[count for _, count in top_industries],
+            y=[industry for industry, _ in top_industries],
+            orientation='h',
+            marker_color='#764ba2',
+            hoverinfo='skip'
+        ),
+        layout=_INDUSTRY_LAYOUT
+    )
+
+
+@dataclass
+class LeadStats:
+    """Aggregated lead statistics shared by dashboard components"""
+    
+    total: int = 0
+    qualified: int = 0
+    score_sum: int = 0
+    today_count: int = 0
+    scores: List[int] = field(default_factory=list)
+    industries: Counter = field(default_factory=Counter)
+    
+    @property
+    def avg_score(self) -> float:
+        """Average lead score"""
+        return self.score_sum / self.total if self.total else 0
+    
+    @property
+    def qualification_rate(self) -> float:
+        """Percentage of qualified leads"""
+        return self.qualified / self.total * 100 if self.total else 0
+
+
+def aggregate_leads(leads: Union[List[Lead], pd.DataFrame]) -> LeadStats:
+    """
+    Compute all dashboard statistics in a single pass
+    
+    Args:
+        leads: List of Lead objects, or a DataFrame of lead dictionaries
+            (aggregated with vectorized pandas operations)
+    
+    Returns:
+        LeadStats instance
+    """
+    today_prefix = datetime.now().strftime('%Y-%m-%d')
+    
+    if isinstance(leads, pd.DataFrame):
+        if leads.empty:
+            return LeadStats()
+        
+        scores = leads['lead_score']
+        return LeadStats(
+            total=len(leads),
+            qualified=int((scores >= Constants.QUALIFIED_SCORE).sum()),
+            score_sum=int(scores.sum()),
+            today_count=int(leads['timestamp'].str.startswith(today_prefix).sum()),
+            scores=scores.tolist(),
+            industries=Counter(leads['industry'].value_counts().to_dict())
+        )
+    
+    stats = LeadStats(total=len(leads))
     for lead in leads:
-        industries[lead.industry] = industries.get(lead.industry, 0) + 1
+        score = lead.lead_score
+        stats.scores.append(score)
+        stats.score_sum += score
+        stats.qualified += lead.is_qualified
+        stats.today_count += lead.timestamp.startswith(today_prefix)
+        stats.industries[lead.industry] += 1
     
-    # Sort and take top 10
-    sorted_industries = sorted(industries.items(), key=lambda x: x[1], reverse=True)[:10]
+    return stats
+
+
+def _as_stats(data: Union[List[Lead], pd.DataFrame, LeadStats]) -> LeadStats:
+    """Accept raw leads, a leads DataFrame, or pre-computed statistics"""
+    return data if isinstance(data, LeadStats) else aggregate_leads(data)
+
+
+def create_pie_chart(data: Union[List[Lead], pd.DataFrame, LeadStats]) -> go.Figure:
+    """Create qualification pie chart"""
+    stats = _as_stats(data)
+    if not stats.total:
+        return _EMPTY_FIG
+    return _pie_figure(stats.qualified, stats.total)
+
+
+def create_score_histogram(data: Union[List[Lead], pd.DataFrame, LeadStats]) -> go.Figure:
+    """Create score distribution histogram (binned server-side, so figure size is independent of lead count)"""
+    scores = _as_stats(data).scores
+    if not len(scores):
+        return _EMPTY_FIG
+    counts, _ = np.histogram(scores, bins=_SCORE_BINS, range=_SCORE_RANGE)
+    return _score_histogram_figure(tuple(counts.tolist()))
+
+
+def create_industry_bar_chart(data: Union[List[Lead], pd.DataFrame, LeadStats]) -> go.Figure:
+    """Create industry breakdown bar chart"""
+    # Top 10 industries (partial selection, no full sort)
+    top_industries = _as_stats(data).industries.most_common(10)
+    if not top_industries:
+        return _EMPTY_FIG
     
-    fig = px.bar(
-        x=[count for _, count in sorted_industries],
-        y=[industry for industry, _ in sorted_industries],
-        orientation='h',
-        color_discrete_sequence=['#764ba2'],
-        labels={'x': 'Number of Leads', 'y': 'Industry'}
-    )
-    fig.update_layout(height=400, showlegend=False)
-    return fig
+    return _industry_bar_figure(tuple(top_industries))
 
 
-def render_metrics_row(leads: List[Lead]):
+def render_metrics_row(data: Union[List[Lead], pd.DataFrame, LeadStats]):
     """Render key metrics in columns"""
+    stats = _as_stats(data)
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Leads", len(leads))
+        st.metric("Total Leads", stats.total)
     
     with col2:
-        qualified = sum(1 for l in leads if l.is_qualified)
-        rate = (qualified / len(leads) * 100) if leads else 0
-        st.metric("Qualified (70+)", qualified, delta=f"{rate:.0f}%")
+        st.metric("Qualified (70+)", stats.qualified, delta=f"{stats.qualification_rate:.0f}%")
     
     with col3:
-        avg_score = sum(l.lead_score for l in leads) / len(leads) if leads else 0
-        st.metric("Average Score", f"{avg_score:.1f}")
+        st.metric("Average Score", f"{stats.avg_score:.1f}")
     
     with col4:
-        from datetime import datetime
-        today = datetime.now().strftime('%Y-%m-%d')
-        today_leads = sum(1 for l in leads if l.timestamp[:10] == today)
-        st.metric("Added Today", today_leads)
+        st.metric("Added Today", stats.today_count)
 
 
 def render_sidebar_stats(leads: List[Lead]):
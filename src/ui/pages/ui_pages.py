@@ -6,17 +6,140 @@ All page rendering logic consolidated
 import streamlit as st
 import pandas as pd
 import io
-import time
+import heapq
+import tempfile
+from dataclasses import astuple, fields
+from operator import attrgetter
+from pathlib import Path
 from datetime import datetime
+from typing import List
 
-from src.config import AppConfig, get_logger
+from src.config import DATA_DIR, AppConfig, get_logger
+from src.models.lead import Lead
 from src.security import SecureConfigManager
 from src.services import DataManager, LeadAnalyzer
 from src.ui.components import *
 from src.utils import make_gdpr_safe
 
+try:
+    import xlsxwriter
+except ImportError:  # Excel export falls back to openpyxl
+    xlsxwriter = None
+
 logger = get_logger(__name__)
 
+# Lead fields used by the dashboard (table, metrics and charts) and their display names
+_DASHBOARD_FIELDS = ['company_name', 'lead_score', 'industry', 'recommended_action', 'url', 'timestamp']
+_DASHBOARD_COLS = {
+    'company_name': 'Company',
+    'lead_score': 'Score',
+    'industry': 'Industry',
+    'recommended_action': 'Action',
+    'url': 'URL'
+}
+_dashboard_getter = attrgetter(*_DASHBOARD_FIELDS)
+
+# All lead fields, in Lead.to_dict() order (used for exports)
+_LEAD_FIELDS = [f.name for f in fields(Lead)]
+_lead_getter = attrgetter(*_LEAD_FIELDS)
+
+# Plotly config for charts that need no hover/zoom interaction
+_STATIC_PLOT_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+# Leads table row limits (rows sent to the browser per rerun)
+_TABLE_MIN_ROWS = 50
+_TABLE_DEFAULT_ROWS = 200
+_TABLE_MAX_ROWS = 5000
+
+# Rows per chunk when writing CSV exports
+_CSV_CHUNK_ROWS = 10000
+
+# Bound for the data caches below: each data version (file mtime + leads_version) adds a key,
+# so only the last few versions stay resident in a long-running server
+_CACHE_MAX_ENTRIES = 8
+
+# Arrow-backed dtypes so st.dataframe serialization needs no conversion
+_DASHBOARD_DTYPES = {
+    'Company': 'string[pyarrow]',
+    'Score': 'int32[pyarrow]',
+    'Industry': 'string[pyarrow]',
+    'Action': 'string[pyarrow]',
+    'URL': 'string[pyarrow]'
+}
+
+
+@st.cache_data(show_spinner=False, max_entries=_CACHE_MAX_ENTRIES)
+def _cached_load_all(version: tuple, _dm: DataManager) -> List[Lead]:
+    """Load all leads, cached on a data version key (_dm is not hashed)"""
+    return _dm.load_all(use_cache=False)
+
+
+@st.cache_data(show_spinner=False, max_entries=_CACHE_MAX_ENTRIES)
+def _leads_to_df(version: tuple, _leads: List[Lead]) -> pd.DataFrame:
+    """Build the dashboard DataFrame (only the needed fields), cached on data version (_leads is not hashed)"""
+    return pd.DataFrame.from_records(map(_dashboard_getter, _leads), columns=_DASHBOARD_FIELDS)
+
+
+@st.cache_data(show_spinner=False, max_entries=_CACHE_MAX_ENTRIES)
+def _cached_lead_stats(version: tuple, _leads: List[Lead]) -> LeadStats:
+    """Aggregate dashboard metrics, cached on data version (_leads is not hashed)"""
+    return aggregate_leads(_leads_to_df(version, _leads))
+
+
+def _excel_value(value):
+    """Convert a DataFrame value to a type xlsxwriter can write (NaN -> blank)"""
+    if value is None or isinstance(value, (str, int)):
+        return value
+    if isinstance(value, float):
+        return None if value != value else value
+    return str(value)
+
+
+def _write_xlsx(df: pd.DataFrame) -> bytes:
+    """
+    Write DataFrame to xlsx bytes, streaming rows with xlsxwriter constant_memory mode
+    
+    Rows are written directly rather than through pd.ExcelWriter, which emits
+    cells column by column and therefore loses data in constant_memory mode.
+    Falls back to pd.ExcelWriter with openpyxl when xlsxwriter is not installed.
+    """
+    buffer = io.BytesIO()
+    if xlsxwriter is None:
+        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+            df.to_excel(writer, index=False, sheet_name='Leads')
+        return buffer.getvalue()
+    
+    workbook = xlsxwriter.Workbook(buffer, {
+        'constant_memory': True,
+        'strings_to_formulas': False,
+        'strings_to_urls': False
+    })
+    worksheet = workbook.add_worksheet('Leads')
+    
+    worksheet.write_row(0, 0, [str(col) for col in df.columns], workbook.add_format({'bold': True}))
+    for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_idx, 0, [_excel_value(value) for value in row])
+    
+    workbook.close()
+    return buffer.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=_CACHE_MAX_ENTRIES)
+def _build_export(version: tuple, gdpr_safe: bool, export_format: str, _leads: List[Lead]) -> bytes:
+    """Serialize leads for download, cached on data version and export options (_leads is not hashed)"""
+    # Read attributes directly: to_dict() (dataclasses.asdict) deep-copies every lead
+    df = pd.DataFrame.from_records(map(_lead_getter, _leads), columns=_LEAD_FIELDS)
+    # df is local to this call, so redaction can replace its columns in place
+    export_df = make_gdpr_safe(df, inplace=True) if gdpr_safe else df
+    
+    if export_format == "Excel (.xlsx)":
+        return _write_xlsx(export_df)
+    
+    # Encode in row chunks straight into the buffer (no intermediate full-size str)
+    buffer = io.BytesIO()
+    export_df.to_csv(buffer, index=False, encoding='utf-8', chunksize=_CSV_CHUNK_ROWS)
+    return buffer.getvalue()
+
 
 class UIPages:
     """Container for all UI page rendering methods"""
@@ -27,13 +150,76 @@ class UIPages:
         self.config_manager = config_manager
         self.data_manager = data_manager
     
+    def _get_config(self) -> AppConfig:
+        """Get AppConfig memoized in session state (invalidated on save or config file change)"""
+        config_file = self.config_manager.config_file
+        mtime = config_file.stat().st_mtime if config_file.exists() else 0
+        
+        config = st.session_state.get('app_config')
+        if config is None or st.session_state.get('app_config_mtime') != mtime:
+            config_dict = self.config_manager.load(use_cache=True)
+            config = AppConfig(**config_dict) if config_dict else AppConfig()
+            st.session_state['app_config'] = config
+            st.session_state['app_config_mtime'] = mtime
+        return config
+    
+    def _leads_version_key(self) -> tuple:
+        """Cache key identifying the current state of the leads data"""
+        data_file = self.data_manager.data_file
+        mtime = data_file.stat().st_mtime if data_file.exists() else 0
+        return (str(data_file), mtime, st.session_state.get('leads_version', 0))
+    
+    def _load_leads(self) -> List[Lead]:
+        """Load leads through the cross-rerun cache"""
+        return _cached_load_all(self._leads_version_key(), self.data_manager)
+    
+    @staticmethod
+    def _bump_leads_version():
+        """Invalidate cached leads after data or test-mode changes"""
+        st.session_state['leads_version'] = st.session_state.get('leads_version', 0) + 1
+    
+    def _get_analyzer(self, config: AppConfig, kb_service=None) -> LeadAnalyzer:
+        """
+        Get a LeadAnalyzer memoized in session state
+        
+        Rebuilt when any config value changes or a different knowledge base or
+        data manager is passed. Kept per session (not in st.cache_resource) since
+        the knowledge base and data manager are per-session objects.
+        """
+        config_key = astuple(config)
+        cached = st.session_state.get('lead_analyzer')
+        if (cached is None or cached[0] != config_key
+                or cached[1] is not kb_service or cached[2] is not self.data_manager):
+            analyzer = LeadAnalyzer(config, self.data_manager, knowledge_base=kb_service)
+            cached = (config_key, kb_service, self.data_manager, analyzer)
+            st.session_state['lead_analyzer'] = cached
+        return cached[3]
+    
+    @staticmethod
+    def _clear_analyzer():
+        """Drop the memoized LeadAnalyzer after settings or profile changes"""
+        st.session_state.pop('lead_analyzer', None)
+    
+    @staticmethod
+    def get_kb_stats(kb_service) -> dict:
+        """Get knowledge base stats memoized in session state (recomputed when kb_version changes)"""
+        version = st.session_state.get('kb_version', 0)
+        if 'kb_stats' not in st.session_state or st.session_state.get('kb_stats_version') != version:
+            st.session_state['kb_stats'] = kb_service.get_stats()
+            st.session_state['kb_stats_version'] = version
+        return st.session_state['kb_stats']
+    
+    @staticmethod
+    def _bump_kb_version():
+        """Invalidate cached knowledge base stats after a document is added or deleted"""
+        st.session_state['kb_version'] = st.session_state.get('kb_version', 0) + 1
+    
     def render_home(self):
         """Render home page"""
         render_hero_section()
         
         # Check if in test mode (cached)
-        config_dict = self.config_manager.load(use_cache=True)
-        config = AppConfig(**config_dict) if config_dict else AppConfig()
+        config = self._get_config()
         
         if not config.has_valid_firecrawl_key() or not config.has_valid_ai_key():
             st.warning(" **Test Mode Active** - Configure API keys in Settings to use real data. Currently using mock data for demonstration.")
@@ -72,16 +258,16 @@ class UIPages:
             """)
         
         # Stats
-        leads = self.data_manager.load_all(use_cache=True)
+        leads = self._load_leads()
         if leads:
             # Check if we're showing test data
             is_test_mode = not config.has_valid_firecrawl_key() or not config.has_valid_ai_key()
-            if is_test_mode and any(lead.id and lead.id >= 9000 for lead in leads):
+            if is_test_mode and self.data_manager.has_test_leads():
                 st.info("📊 **Test Mode**: Stats below show sample data. Configure API keys in Settings for real data.")
             
             st.markdown("---")
             st.markdown("## Your Stats")
-            render_metrics_row(leads)
+            render_metrics_row(_cached_lead_stats(self._leads_version_key(), leads))
     
     def render_settings(self):
         """Render settings page"""
@@ -89,8 +275,7 @@ class UIPages:
         st.markdown("Configure your API keys. All keys are encrypted locally.")
         
         # Load current config
-        config_dict = self.config_manager.load()
-        config = AppConfig(**config_dict) if config_dict else AppConfig()
+        config = self._get_config()
         
         # Firecrawl
         with st.expander("Firecrawl API", expanded=True):
@@ -107,7 +292,7 @@ class UIPages:
             with col2:
                 st.markdown("<br>", unsafe_allow_html=True)
                 if st.button("Test", use_container_width=True):
-                    analyzer = LeadAnalyzer(config, self.data_manager)
+                    analyzer = self._get_analyzer(config)
                     success, msg = analyzer.test_firecrawl_connection()
                     if success:
                         show_success(msg)
@@ -154,8 +339,11 @@ class UIPages:
                 }
                 
                 if self.config_manager.save(new_config_dict):
-                    show_success("Settings saved securely!")
-                    time.sleep(1)
+                    st.session_state.pop('app_config', None)
+                    self._clear_analyzer()
+                    # Test-mode sample leads depend on configured keys
+                    self._bump_leads_version()
+                    st.toast("Settings saved securely!", icon="✅")
                     st.rerun()
         
         with col2:
@@ -167,7 +355,7 @@ class UIPages:
         st.markdown("### Security Information")
         st.info("""
         **Data Protection:**
-        - ✅ API keys encrypted with Fernet
+        - ✅ API keys encrypted with AES-256-GCM
         - ✅ Local storage only
         - ✅ No external data transmission (except API calls)
         """)
@@ -177,8 +365,7 @@ class UIPages:
         st.title("User Profile")
         st.markdown("Define your company profile to guide AI analysis.")
         
-        config_dict = self.config_manager.load()
-        config = AppConfig(**config_dict) if config_dict else AppConfig()
+        config = self._get_config()
         
         my_website = st.text_input(
             "Company Website",
@@ -206,24 +393,21 @@ class UIPages:
         
         with col1:
             if st.button("Save Profile", type="primary", use_container_width=True):
-                current = self.config_manager.load()
-                current.update({
+                if self.config_manager.update({
                     'my_website': my_website,
                     'my_value_proposition': my_value_proposition,
                     'my_icp': my_icp
-                })
-                
-                if self.config_manager.save(current):
-                    show_success("Profile saved!")
-                    time.sleep(1)
+                }):
+                    st.session_state.pop('app_config', None)
+                    self._clear_analyzer()
+                    st.toast("Profile saved!", icon="✅")
                     st.rerun()
     
     def render_lead_chat(self):
         """Render lead chat page"""
         st.title("Lead Chat & Analyzer")
         
-        config_dict = self.config_manager.load(use_cache=True)
-        config = AppConfig(**config_dict) if config_dict else AppConfig()
+        config = self._get_config()
         
         # Check if in test mode
         is_firecrawl_test = not config.has_valid_firecrawl_key()
@@ -231,7 +415,8 @@ class UIPages:
         
         # Check if Knowledge Base is available
         kb_service = st.session_state.get('kb_service', None)
-        kb_active = kb_service and kb_service.get_stats()['total_documents'] > 0
+        kb_stats = self.get_kb_stats(kb_service) if kb_service else None
+        kb_active = kb_stats is not None and kb_stats['total_documents'] > 0
         
         if is_firecrawl_test or is_ai_test:
             test_components = []
@@ -244,13 +429,12 @@ class UIPages:
         
         # Show KB status
         if kb_active:
-            kb_stats = kb_service.get_stats()
             st.success(f"✨ **Knowledge Base Active**: {kb_stats['total_documents']} documents loaded. AI will use your company knowledge for personalized analysis.")
         else:
             st.info("💡 Upload documents to Knowledge Base for AI-powered analysis using your company information.")
         
-        # Initialize analyzer with KB support
-        analyzer = LeadAnalyzer(config, self.data_manager, knowledge_base=kb_service)
+        # Analyzer with KB support (reused across reruns until settings change)
+        analyzer = self._get_analyzer(config, kb_service)
         
         # URL input
         st.markdown("### Prospect URL")
@@ -284,15 +468,22 @@ class UIPages:
                     # Clear sidebar cache since we added new data
                     if "sidebar_quick_stats" in st.session_state:
                         del st.session_state["sidebar_quick_stats"]
+                    self._bump_leads_version()
                     
                     show_success(f"Lead #{lead_id} analyzed!")
-                    lead = self.data_manager.get_lead(lead_id)
-                    if lead:
-                        st.markdown("---")
-                        render_lead_card(lead)
+                    st.session_state['last_analyzed_lead_id'] = lead_id
                 else:
+                    st.session_state.pop('last_analyzed_lead_id', None)
                     show_error(message)
         
+        # Latest single analysis stays on screen across reruns (e.g. opening its drafts)
+        last_lead_id = st.session_state.get('last_analyzed_lead_id')
+        if last_lead_id is not None:
+            lead = self.data_manager.get_lead(last_lead_id)
+            if lead:
+                st.markdown("---")
+                render_lead_card(lead, key_prefix="latest_")
+        
         # Process bulk
         if analyze_bulk and bulk_urls:
             urls = [u.strip() for u in bulk_urls.split('\n') if u.strip()]
@@ -301,31 +492,36 @@ class UIPages:
             progress = st.progress(0)
             status = st.empty()
             
-            for idx, url in enumerate(urls):
-                status.text(f"Processing {idx+1}/{len(urls)}: {url}")
-                analyzer.analyze_and_save(url)
-                progress.progress((idx + 1) / len(urls))
-                time.sleep(1)
+            def on_progress(done: int, total: int, url: str):
+                status.text(f"Processed {done}/{total}: {url}")
+                progress.progress(done / total)
+            
+            # Scrape + analyze concurrently (paced by rate_limit_delay), saved on this thread
+            results = analyzer.analyze_bulk_urls(urls, progress_callback=on_progress)
+            failures = [f"{r['url']}: {r['message']}" for r in results if not r['success']]
             
             # Clear sidebar cache since we added new data
             if "sidebar_quick_stats" in st.session_state:
                 del st.session_state["sidebar_quick_stats"]
+            self._bump_leads_version()
             
             status.empty()
             progress.empty()
-            show_success(f"Processed {len(urls)} leads!")
+            show_success(f"Processed {len(results) - len(failures)}/{len(results)} leads!")
+            if failures:
+                show_error("Failed:\n\n" + "\n\n".join(failures))
         
         # Recent leads
         st.markdown("---")
         st.markdown("### Recent Analyses")
         
-        leads = self.data_manager.load_all(use_cache=True)
+        leads = self._load_leads()
         
         # Check if we're showing test data  
-        if (is_firecrawl_test or is_ai_test) and any(lead.id and lead.id >= 9000 for lead in leads):
+        if (is_firecrawl_test or is_ai_test) and self.data_manager.has_test_leads():
             st.info("📊 **Test Mode**: Recent analyses below show sample data to demonstrate functionality")
         
-        recent = sorted(leads, key=lambda x: x.timestamp, reverse=True)[:5]
+        recent = heapq.nlargest(5, leads, key=lambda x: x.timestamp)
         
         if recent:
             for lead in recent:
@@ -338,23 +534,27 @@ class UIPages:
         """Render dashboard page"""
         st.title("Dashboard & Analytics")
         
-        leads = self.data_manager.load_all(use_cache=True)
+        leads = self._load_leads()
         
         # Check if we're showing test data
-        config_dict = self.config_manager.load(use_cache=True)
-        config = AppConfig(**config_dict) if config_dict else AppConfig()
+        config = self._get_config()
         is_test_mode = not config.has_valid_firecrawl_key() or not config.has_valid_ai_key()
         
-        if is_test_mode and any(lead.id and lead.id >= 9000 for lead in leads):
+        if is_test_mode and self.data_manager.has_test_leads():
             st.info("📊 **Test Mode**: Showing sample data to demonstrate functionality. Configure API keys in Settings for real data.")
         
         if not leads:
             show_info("No leads yet. Go to Lead Chat to analyze prospects!")
             return
         
+        # DataFrame and aggregates are cached across reruns on the data version
+        version = self._leads_version_key()
+        df = _leads_to_df(version, leads)
+        stats = _cached_lead_stats(version, leads)
+        
         # Metrics
         st.markdown("### Key Metrics")
-        render_metrics_row(leads)
+        render_metrics_row(stats)
         
         # Charts
         st.markdown("---")
@@ -362,35 +562,45 @@ class UIPages:
         
         with col1:
             st.markdown("### Lead Qualification")
-            st.plotly_chart(create_pie_chart(leads), use_container_width=True)
+            st.plotly_chart(create_pie_chart(stats), use_container_width=True, config=_STATIC_PLOT_CONFIG)
         
         with col2:
             st.markdown("### Score Distribution")
-            st.plotly_chart(create_score_histogram(leads), use_container_width=True)
+            st.plotly_chart(create_score_histogram(stats), use_container_width=True)
         
         # Industry
         st.markdown("---")
         st.markdown("### Industry Breakdown")
-        st.plotly_chart(create_industry_bar_chart(leads), use_container_width=True)
+        st.plotly_chart(create_industry_bar_chart(stats), use_container_width=True, config=_STATIC_PLOT_CONFIG)
         
         # Table
         st.markdown("---")
         st.markdown("### All Leads")
         
-        df = pd.DataFrame([l.to_dict() for l in leads])
-        display_cols = ['company_name', 'lead_score', 'industry', 'recommended_action', 'url']
-        available_cols = [c for c in display_cols if c in df.columns]
-        
-        if available_cols:
-            df_display = df[available_cols].rename(columns={
-                'company_name': 'Company',
-                'lead_score': 'Score',
-                'industry': 'Industry',
-                'recommended_action': 'Action',
-                'url': 'URL'
-            })
-            df_display = df_display.sort_values('Score', ascending=False)
-            st.dataframe(df_display, use_container_width=True, height=400)
+        # Only the top rows are sent to the browser; the export below contains every lead
+        total_rows = len(df)
+        if total_rows > _TABLE_MIN_ROWS:
+            top_n = st.slider(
+                "Rows to show",
+                min_value=_TABLE_MIN_ROWS,
+                max_value=min(_TABLE_MAX_ROWS, total_rows),
+                value=min(_TABLE_DEFAULT_ROWS, total_rows)
+            )
+            st.caption(f"Showing top {top_n} of {total_rows} leads by score")
+        else:
+            top_n = total_rows
+        
+        df_display = df[list(_DASHBOARD_COLS)].rename(columns=_DASHBOARD_COLS)
+        df_display = df_display.nlargest(top_n, 'Score').astype(_DASHBOARD_DTYPES)
+        st.dataframe(
+            df_display,
+            use_container_width=True,
+            height=400,
+            column_config={
+                'Score': st.column_config.NumberColumn(format="%d"),
+                'URL': st.column_config.LinkColumn()
+            }
+        )
         
         # Export
         st.markdown("---")
@@ -404,28 +614,23 @@ class UIPages:
         with col2:
             export_format = st.selectbox("Format", ["Excel (.xlsx)", "CSV (.csv)"])
         
-        export_df = make_gdpr_safe(df) if gdpr_safe else df
+        export_data = _build_export(version, gdpr_safe, export_format, leads)
         
         if export_format == "Excel (.xlsx)":
-            buffer = io.BytesIO()
-            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                export_df.to_excel(writer, index=False, sheet_name='Leads')
-            buffer.seek(0)
-            
             st.download_button(
                 "📥 Download Excel",
-                data=buffer,
+                data=export_data,
                 file_name=f"leads_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
         else:
-            csv = export_df.to_csv(index=False)
             st.download_button(
                 "📥 Download CSV",
-                data=csv,
+                data=export_data,
                 file_name=f"leads_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                 mime="text/csv"
-            )    
+            )
+    
     def render_knowledge_base(self, knowledge_base_service):
         """Render Knowledge Base management page"""
         st.title("Knowledge Base")
@@ -436,7 +641,7 @@ class UIPages:
             return
         
         # Get statistics
-        stats = knowledge_base_service.get_stats()
+        stats = self.get_kb_stats(knowledge_base_service)
         
         # Display enhanced stats
         st.markdown("### Knowledge Base Statistics")
@@ -490,26 +695,21 @@ class UIPages:
             with col2:
                 if st.button("Upload & Index", type="primary", use_container_width=True):
                     with st.spinner("Processing document..."):
-                        # Save temporary file
-                        temp_path = f"data/temp_{uploaded_file.name}"
-                        with open(temp_path, "wb") as f:
-                            f.write(uploaded_file.getbuffer())
-                        
-                        # Add to knowledge base
-                        success, message, document = knowledge_base_service.add_document(
-                            temp_path,
-                            uploaded_file.name
-                        )
-                        
-                        # Clean up temp file
-                        import os
-                        if os.path.exists(temp_path):
-                            os.remove(temp_path)
+                        # Private temp directory (unique per upload, removed even on error);
+                        # a directory rather than NamedTemporaryFile so the file can be reopened on Windows
+                        with tempfile.TemporaryDirectory(dir=DATA_DIR) as temp_dir:
+                            temp_path = Path(temp_dir) / Path(uploaded_file.name).name
+                            temp_path.write_bytes(uploaded_file.getbuffer())
+                            
+                            # Add to knowledge base
+                            success, message, document = knowledge_base_service.add_document(
+                                str(temp_path),
+                                uploaded_file.name
+                            )
                         
                         if success:
-                            st.success(f"✅ {message}")
-                            st.info(f"Created {document.num_chunks} searchable chunks")
-                            time.sleep(1)
+                            self._bump_kb_version()
+                            st.toast(f"{message} ({document.num_chunks} searchable chunks)", icon="✅")
                             st.rerun()
                         else:
                             st.error(f"❌ {message}")
@@ -555,8 +755,8 @@ class UIPages:
                         if st.button("🗑️ Delete", key=f"delete_{doc.id}", use_container_width=True):
                             success, message = knowledge_base_service.delete_document(doc.id)
                             if success:
-                                st.success(message)
-                                time.sleep(1)
+                                self._bump_kb_version()
+                                st.toast(message, icon="✅")
                                 st.rerun()
                             else:
                                 st.error(message)
@@ -7,10 +7,20 @@ import pandas as pd
 import re
 from typing import List
 
+try:
+    # Linear-time DFA engine for the PII scan; both patterns avoid backreferences
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
+
 from src.config import Constants, get_logger
 
 logger = get_logger(__name__)
 
+# Copy-on-Write lets redact_dataframe share untouched column buffers (always on from pandas 3)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
 
 class GDPRCompliance:
     """GDPR compliance utilities"""
@@ -19,6 +29,11 @@ class GDPRCompliance:
     EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
     PHONE_PATTERN = re.compile(r'(\+\d{1,3}[-.\s]?)?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}')
     
+    # Scan engine versions of the patterns. Kept as two passes: a single alternation lets a
+    # phone match starting earlier consume an adjacent email's local part ("555 1234john@x.com")
+    _EMAIL_RE = _re_engine.compile(EMAIL_PATTERN.pattern)
+    _PHONE_RE = _re_engine.compile(PHONE_PATTERN.pattern)
+    
     # Personal data column names (case-insensitive)
     PERSONAL_COLUMNS = [
         'contact_name', 'first_name', 'last_name',
@@ -26,36 +41,64 @@ class GDPRCompliance:
         'direct_email', 'personal_email',
         'home_address', 'personal_address'
     ]
+    _PERSONAL_RE = re.compile('|'.join(map(re.escape, PERSONAL_COLUMNS)))
+    
+    # Safe column name indicators (company data, not personal)
+    SAFE_INDICATORS = [
+        'company', 'business', 'organization',
+        'industry', 'sector', 'cvr', 'vat',
+        'main_phone', 'general_email', 'info',
+        'score', 'analysis', 'recommendation'
+    ]
+    _SAFE_RE = re.compile('|'.join(map(re.escape, SAFE_INDICATORS)))
+    
+    # Lead fields redacted by create_gdpr_safe_export
+    EXPORT_REDACTED_FIELDS = frozenset({
+        'contact_name', 'personal_mobile', 'direct_email',
+        'scraped_content'  # May contain personal data
+    })
+    
+    @staticmethod
+    def _lowered_columns(df: pd.DataFrame) -> pd.Index:
+        """Lower-case all column names in one Index-level operation"""
+        return df.columns.astype(str).str.lower()
     
     @staticmethod
     def redact_dataframe(df: pd.DataFrame, 
-                        redacted_text: str = Constants.REDACTED_TEXT) -> pd.DataFrame:
+                        redacted_text: str = Constants.REDACTED_TEXT,
+                        inplace: bool = False) -> pd.DataFrame:
         """
         Redact personal data from DataFrame
         
         Args:
             df: DataFrame to redact
             redacted_text: Text to replace personal data with
+            inplace: Replace the personal columns on df itself instead of a new frame
             
         Returns:
-            DataFrame with redacted personal data
+            DataFrame with redacted personal data (df itself if inplace)
         """
-        df_safe = df.copy()
-        
-        # Redact known personal columns
-        for col in df_safe.columns:
-            col_lower = col.lower()
-            
-            # Check if column name indicates personal data
-            if any(personal_col in col_lower for personal_col in GDPRCompliance.PERSONAL_COLUMNS):
-                df_safe[col] = redacted_text
-                logger.info(f"Redacted column: {col}")
+        # Match all column names against the personal-column pattern in one pass
+        mask = GDPRCompliance._lowered_columns(df).str.contains(GDPRCompliance._PERSONAL_RE)
+        redacted_cols = df.columns[mask].tolist()
+        
+        if inplace:
+            # Whole-column replacement (positional setitem would keep numeric dtypes and reject text)
+            df_safe = df
+            if redacted_cols:
+                df_safe[redacted_cols] = redacted_text
+        else:
+            # Only the redacted columns are materialized; the rest share buffers with df
+            df_safe = df.assign(**dict.fromkeys(redacted_cols, redacted_text))
+        
+        if redacted_cols:
+            logger.info(f"Redacted columns: {redacted_cols}")
         
         logger.info(f"GDPR redaction applied to DataFrame ({len(df_safe)} rows)")
         return df_safe
     
-    @staticmethod
-    def redact_text(text: str, 
+    @classmethod
+    def redact_text(cls, text: str, 
                    redacted_text: str = "[REDACTED]") -> str:
         """
         Redact personal data from text
@@ -70,28 +113,14 @@ class GDPRCompliance:
         if not text:
             return text
         
-        # Redact emails
-        text = GDPRCompliance.EMAIL_PATTERN.sub(redacted_text, text)
-        
-        # Redact phone numbers
-        text = GDPRCompliance.PHONE_PATTERN.sub(redacted_text, text)
-        
-        return text
+        # Redact emails first, then phone numbers (order matters, see _EMAIL_RE)
+        text = cls._EMAIL_RE.sub(redacted_text, text)
+        return cls._PHONE_RE.sub(redacted_text, text)
     
-    @staticmethod
-    def is_gdpr_safe_column(column_name: str) -> bool:
+    @classmethod
+    def is_gdpr_safe_column(cls, column_name: str) -> bool:
         """Check if column name indicates GDPR-safe data"""
-        col_lower = column_name.lower()
-        
-        # Safe columns (company data, not personal)
-        safe_indicators = [
-            'company', 'business', 'organization',
-            'industry', 'sector', 'cvr', 'vat',
-            'main_phone', 'general_email', 'info',
-            'score', 'analysis', 'recommendation'
-        ]
-        
-        return any(indicator in col_lower for indicator in safe_indicators)
+        return bool(cls._SAFE_RE.search(column_name.lower()))
     
     @staticmethod
     def get_gdpr_compliance_report(df: pd.DataFrame) -> dict:
@@ -104,23 +133,19 @@ class GDPRCompliance:
         Returns:
             Dictionary with compliance information
         """
+        # Partition columns with vectorized name matching (personal takes precedence over safe)
+        lower = GDPRCompliance._lowered_columns(df)
+        personal_mask = lower.str.contains(GDPRCompliance._PERSONAL_RE)
+        safe_mask = ~personal_mask & lower.str.contains(GDPRCompliance._SAFE_RE)
+        unknown_mask = ~(personal_mask | safe_mask)
+        
         report = {
             'total_columns': len(df.columns),
-            'personal_columns': [],
-            'safe_columns': [],
-            'unknown_columns': []
+            'personal_columns': df.columns[personal_mask].tolist(),
+            'safe_columns': df.columns[safe_mask].tolist(),
+            'unknown_columns': df.columns[unknown_mask].tolist()
         }
         
-        for col in df.columns:
-            col_lower = col.lower()
-            
-            if any(p in col_lower for p in GDPRCompliance.PERSONAL_COLUMNS):
-                report['personal_columns'].append(col)
-            elif GDPRCompliance.is_gdpr_safe_column(col):
-                report['safe_columns'].append(col)
-            else:
-                report['unknown_columns'].append(col)
-        
         report['compliance_percentage'] = (
             len(report['safe_columns']) / len(df.columns) * 100
             if len(df.columns) > 0 else 0
@@ -139,27 +164,18 @@ class GDPRCompliance:
         Returns:
             List with redacted personal data
         """
-        safe_leads = []
-        
-        for lead in leads:
-            safe_lead = lead.copy()
-            
-            # Remove personal fields entirely
-            personal_fields = [
-                'contact_name', 'personal_mobile', 'direct_email',
-                'scraped_content'  # May contain personal data
-            ]
-            
-            for field in personal_fields:
-                if field in safe_lead:
-                    safe_lead[field] = Constants.REDACTED_TEXT
-            
-            safe_leads.append(safe_lead)
+        # Per-lead merge rather than a DataFrame round-trip: leads may have differing
+        # keys, and a frame would add NaN-filled columns and coerce int dtypes
+        redacted_fields = GDPRCompliance.EXPORT_REDACTED_FIELDS
+        safe_leads = [
+            {**lead, **dict.fromkeys(redacted_fields & lead.keys(), Constants.REDACTED_TEXT)}
+            for lead in leads
+        ]
         
         logger.info(f"Created GDPR-safe export for {len(safe_leads)} leads")
         return safe_leads
 
 
-def make_gdpr_safe(df: pd.DataFrame) -> pd.DataFrame:
+def make_gdpr_safe(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
     """Convenience function for GDPR redaction"""
-    return GDPRCompliance.redact_dataframe(df)
+    return GDPRCompliance.redact_dataframe(df, inplace=inplace)
@@ -0,0 +1,19 @@
+"""
+Shared pytest fixtures
+"""
+
+import pytest
+
+from src.security import KeyManager
+
+
+@pytest.fixture(scope="session")
+def shared_km(tmp_path_factory):
+    """KeyManager with one key generated per test session (for tests that don't check key creation)"""
+    key_dir = tmp_path_factory.mktemp("km")
+    return KeyManager(key_dir / "test.key")
+
+
+def pytest_configure(config):
+    """Register custom markers"""
+    config.addinivalue_line("markers", "perf: performance regression tests (deselect with -m 'not perf')")
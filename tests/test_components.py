@@ -0,0 +1,43 @@
+"""
+Test UI Components
+Unit tests for lead card rendering
+"""
+
+import pytest
+
+from src.models.lead import Lead
+from src.ui.components.charts import _lead_card_markdown
+
+
+class TestLeadCard:
+    """Test lead card markup"""
+    
+    def test_analysis_html_is_escaped(self):
+        """Test that LLM/scraped text cannot inject HTML"""
+        lead = Lead(
+            url="https://example.com",
+            company_name="Acme & Co",
+            lead_score=75,
+            score_rationale="<script>alert('xss')</script>",
+            key_insights='<img src=x onerror="alert(1)">',
+            fit_analysis="Good fit"
+        )
+        markup = _lead_card_markdown(lead)
+        
+        assert "<script>" not in markup
+        assert "&lt;script&gt;" in markup
+        assert "<img" not in markup
+        assert "Acme &amp; Co" in markup
+        assert 'href="https://example.com"' in markup
+    
+    def test_non_web_url_not_linked(self):
+        """Test that javascript: URLs are shown as text, not links"""
+        lead = Lead(url="javascript:alert(1)", company_name="Acme", lead_score=50)
+        markup = _lead_card_markdown(lead)
+        
+        assert "href=" not in markup
+        assert "javascript:alert(1)" in markup
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
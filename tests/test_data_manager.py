@@ -0,0 +1,35 @@
+"""
+Test Data Manager
+Unit tests for lead storage
+"""
+
+import json
+import pytest
+
+from src.models.lead import Lead
+from src.services.data_manager import DataManager
+
+
+def _record(lead_id, score):
+    """Stored lead record"""
+    return {'id': lead_id, 'url': f"https://company{lead_id}.com",
+            'company_name': f"Company {lead_id}", 'lead_score': score}
+
+
+class TestDataManager:
+    """Test lead storage"""
+    
+    def test_invalid_scores_skipped_and_ids_not_reused(self, tmp_path):
+        """Test records with bad scores are skipped and new IDs follow the highest ID"""
+        data_file = tmp_path / "leads.json"
+        data_file.write_text(json.dumps([_record(1, 70), _record(2, "high"), _record(3, 85)]))
+        dm = DataManager(data_file)
+        
+        assert [lead.id for lead in dm.load_all(use_cache=False)] == [1, 3]
+        
+        new_id = dm.add_lead(Lead(url="https://new.com", company_name="New", lead_score=60))
+        assert new_id == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
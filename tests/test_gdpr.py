@@ -0,0 +1,31 @@
+"""
+Test GDPR Module
+Unit tests for personal data redaction
+"""
+
+import pytest
+
+from src.utils.gdpr import GDPRCompliance
+
+
+class TestRedactText:
+    """Test text redaction"""
+    
+    @pytest.mark.parametrize("text, expected", [
+        ("call 555 1234john@x.com", "call [REDACTED] [REDACTED]"),
+        ("id 12-34 56bob@x.com", "id [REDACTED] [REDACTED]"),
+        ("mail john@example.com or +45 1234 5678", "mail [REDACTED] or [REDACTED]"),
+    ])
+    def test_email_adjacent_to_digits_is_redacted(self, text, expected):
+        """Test emails directly after phone-like digits are not leaked"""
+        redacted = GDPRCompliance.redact_text(text)
+        assert redacted == expected
+        assert "@" not in redacted
+    
+    def test_empty_text(self):
+        """Test empty input is returned unchanged"""
+        assert GDPRCompliance.redact_text("") == ""
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
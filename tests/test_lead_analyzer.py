@@ -0,0 +1,145 @@
+"""
+Test Lead Analyzer
+Unit tests for concurrent bulk URL analysis
+"""
+
+import pytest
+import threading
+import types
+from unittest.mock import MagicMock
+
+from src.config import AppConfig
+from src.models.lead import Lead
+from src.services import lead_analyzer
+from src.services.lead_analyzer import LeadAnalyzer
+
+URLS = [f"https://company{i}.com" for i in range(4)]
+
+
+def make_analyzer(workers: int = 4, delay: float = 0.0) -> LeadAnalyzer:
+    """LeadAnalyzer in test mode with a mocked DataManager"""
+    config = AppConfig(rate_limit_delay=delay, bulk_max_workers=workers)
+    data_manager = MagicMock()
+    data_manager.add_lead.side_effect = lambda lead: URLS.index(lead.url) + 100
+    return LeadAnalyzer(config, data_manager)
+
+
+def ok_result(url: str):
+    """Successful analyze_single_url result for a URL"""
+    return True, "ok", Lead(url=url, company_name="Acme", lead_score=80)
+
+
+class TestBulkAnalysis:
+    """Test analyze_bulk_urls"""
+    
+    def test_results_in_input_order(self, monkeypatch):
+        """Test results keep input order when workers finish out of order"""
+        analyzer = make_analyzer()
+        last_done = threading.Event()
+        finished = []
+        
+        def fake_analyze(url):
+            # First URL only finishes after the last one has
+            if url == URLS[0]:
+                assert last_done.wait(timeout=5)
+            result = ok_result(url)
+            finished.append(url)
+            if url == URLS[-1]:
+                last_done.set()
+            return result
+        
+        monkeypatch.setattr(analyzer, "analyze_single_url", fake_analyze)
+        results = analyzer.analyze_bulk_urls(URLS)
+        
+        assert finished[0] != URLS[0]
+        assert [r['url'] for r in results] == URLS
+        assert [r['lead_id'] for r in results] == [100, 101, 102, 103]
+        assert all(r['success'] for r in results)
+    
+    def test_failure_does_not_abort_others(self, monkeypatch):
+        """Test one failing URL is reported without stopping the rest"""
+        analyzer = make_analyzer()
+        
+        def fake_analyze(url):
+            if url == URLS[1]:
+                raise RuntimeError("scrape exploded")
+            return ok_result(url)
+        
+        progress = []
+        monkeypatch.setattr(analyzer, "analyze_single_url", fake_analyze)
+        results = analyzer.analyze_bulk_urls(
+            URLS, progress_callback=lambda done, total, url: progress.append((done, total, url))
+        )
+        
+        assert [r['success'] for r in results] == [True, False, True, True]
+        assert "scrape exploded" in results[1]['message']
+        assert results[1]['lead_id'] is None
+        assert analyzer.data_manager.add_lead.call_count == 3
+        
+        # Every URL, including the failed one, is reported once
+        assert sorted(url for _, _, url in progress) == sorted(URLS)
+        assert [done for done, _, _ in progress] == [1, 2, 3, 4]
+        assert all(total == len(URLS) for _, total, _ in progress)
+    
+    def test_leads_saved_on_calling_thread(self, monkeypatch):
+        """Test DataManager writes happen only on the calling thread"""
+        analyzer = make_analyzer()
+        analyze_threads = set()
+        save_threads = set()
+        
+        def fake_analyze(url):
+            analyze_threads.add(threading.get_ident())
+            return ok_result(url)
+        
+        def fake_add_lead(lead):
+            save_threads.add(threading.get_ident())
+            return 1
+        
+        monkeypatch.setattr(analyzer, "analyze_single_url", fake_analyze)
+        analyzer.data_manager.add_lead.side_effect = fake_add_lead
+        analyzer.analyze_bulk_urls(URLS)
+        
+        assert save_threads == {threading.get_ident()}
+        assert threading.get_ident() not in analyze_threads
+    
+    def test_starts_spaced_by_delay(self, monkeypatch):
+        """Test request starts are spaced by the configured delay (frozen clock)"""
+        analyzer = make_analyzer(delay=2.5)
+        sleeps = []
+        fake_time = types.SimpleNamespace(monotonic=lambda: 100.0, sleep=sleeps.append)
+        monkeypatch.setattr(lead_analyzer, "time", fake_time)
+        monkeypatch.setattr(analyzer, "analyze_single_url", ok_result)
+        
+        analyzer.analyze_bulk_urls(URLS)
+        
+        # First start is immediate; each later start waits one more delay
+        assert sorted(sleeps) == [2.5, 5.0, 7.5]
+    
+    def test_single_worker_is_sequential(self, monkeypatch):
+        """Test bulk_max_workers=1 analyzes URLs one at a time in input order"""
+        analyzer = make_analyzer(workers=1)
+        calls = []
+        active = 0
+        max_active = 0
+        lock = threading.Lock()
+        
+        def fake_analyze(url):
+            nonlocal active, max_active
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            calls.append(url)
+            with lock:
+                active -= 1
+            return ok_result(url)
+        
+        monkeypatch.setattr(analyzer, "analyze_single_url", fake_analyze)
+        results = analyzer.analyze_bulk_urls(URLS)
+        
+        assert calls == URLS
+        assert max_active == 1
+        assert [r['url'] for r in results] == URLS
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,33 @@
+"""
+Performance regression tests for the security module
+Run with: pytest -m perf (skip with: pytest -m "not perf")
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.security import hash_api_key
+
+pytestmark = pytest.mark.perf
+
+
+class TestSecurityPerformance:
+    """Guard the hot encryption/hashing paths against large regressions"""
+    
+    def test_encrypt_dict_throughput(self, benchmark, shared_km):
+        """Test that 1 KB config encryption stays on the fast AES-GCM path"""
+        data = {'k': 'x' * 1024}
+        benchmark.pedantic(shared_km.encrypt_dict, args=(data,), rounds=100, iterations=50)
+        
+        # ~10x headroom over AES-NI speeds; a software AES fallback would trip this
+        if not benchmark.disabled:  # --benchmark-disable runs once without stats
+            assert benchmark.stats['mean'] < 5e-5
+    
+    def test_hash_api_key_throughput(self, benchmark):
+        """Test API key hashing speed (uncached path)"""
+        # __wrapped__ bypasses the lru_cache so the hash itself is measured
+        benchmark.pedantic(hash_api_key.__wrapped__, args=("sk-1234567890abcdef",), rounds=100, iterations=50)
+        
+        if not benchmark.disabled:
+            assert benchmark.stats['mean'] < 1e-5